@@ -0,0 +1,56 @@
+import time
+from pathlib import Path
+
+import orjson
+import pytest
+import requests
+
+from zenoti_tool.client import ZenotiApiClient
+from zenoti_tool.config import ZenotiConfig
+
+
+class BookingResponse:
+    def __init__(self, status_code, data):
+        self.status_code = status_code
+        self.content = orjson.dumps(data)
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} error", response=self)
+
+
+class BookingSession:
+    """Echoes booking payloads; a payload with ``"fail": true`` gets a 400.
+
+    ``"delay"`` (seconds) holds the response back so bookings finish out of order.
+    """
+
+    def mount(self, prefix, adapter):
+        pass
+
+    def post(self, url, **kwargs):
+        return BookingResponse(200, {"access_token": "token", "expires_in": 3600})
+
+    def request(self, method, url, **kwargs):
+        payload = kwargs["json"] or {}
+        time.sleep(payload.get("delay", 0))
+        if payload.get("fail"):
+            return BookingResponse(400, {"error": "rejected"})
+        return BookingResponse(200, {"booked": payload.get("n")})
+
+
+@pytest.fixture
+def booking_client():
+    config = ZenotiConfig(
+        base_url="https://api.example.test",
+        app_id="app",
+        app_secret="secret",
+        api_key="key",
+        token_url="https://api.example.test/token",
+        templates_path=Path("templates.jsonl"),
+        center_id="center",
+        account_name="account",
+        user_name="user",
+        password="password",
+    )
+    return ZenotiApiClient(config, session=BookingSession())
@@ -0,0 +1,35 @@
+import pytest
+
+from zenoti_tool.booking import BookingManager
+from zenoti_tool.templates import Template, TemplateStore
+
+
+@pytest.fixture
+def manager(tmp_path, booking_client):
+    TemplateStore._CACHE.clear()
+    store = TemplateStore(tmp_path / "templates.jsonl")
+    store.save([Template("slot", {"n": 0})])
+    yield BookingManager(booking_client, store)
+    TemplateStore._CACHE.clear()
+
+
+def test_book_many_returns_results_in_job_order(manager):
+    jobs = [("slot", {"n": n, "delay": 0.01 * (3 - n)}) for n in range(4)]
+    results = manager.book_many("center", jobs, max_workers=4)
+    assert results == [{"ok": {"booked": n}} for n in range(4)]
+
+
+def test_book_many_collects_failures_without_stopping(manager):
+    results = manager.book_many("center", [("slot", None), ("slot", {"fail": True}), ("slot", {"n": 2})])
+    assert results[0] == {"ok": {"booked": 0}}
+    assert "400" in results[1]["error"]
+    assert results[2] == {"ok": {"booked": 2}}
+
+
+def test_book_many_books_nothing_for_unknown_template(manager, monkeypatch):
+    calls = []
+    monkeypatch.setattr(manager.client.session, "request", lambda *args, **kwargs: calls.append(args))
+    with pytest.raises(ValueError, match="not found"):
+        manager.book_many("center", [("slot", None), ("missing", None)])
+    assert calls == []
+
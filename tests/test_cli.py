@@ -0,0 +1,65 @@
+from datetime import date
+
+import orjson
+import pytest
+import typer
+from typer.testing import CliRunner
+
+from zenoti_tool import cli
+from zenoti_tool.templates import Template, TemplateStore
+
+runner = CliRunner()
+
+
+@pytest.fixture
+def services(tmp_path, booking_client, monkeypatch):
+    TemplateStore._CACHE.clear()
+    store = TemplateStore(tmp_path / "templates.jsonl")
+    store.save([Template("slot", {"n": 0})])
+    monkeypatch.setattr(cli, "get_services", lambda templates_path=None: (store, booking_client))
+    yield store, booking_client
+    TemplateStore._CACHE.clear()
+
+
+def write_jobs(tmp_path, jobs):
+    path = tmp_path / "jobs.json"
+    path.write_bytes(orjson.dumps(jobs))
+    return str(path)
+
+
+def test_book_appointments_prints_results_in_order(tmp_path, services):
+    jobs = write_jobs(tmp_path, [{"template": "slot", "overrides": {"n": n}} for n in range(3)])
+    result = runner.invoke(cli.app, ["book-appointments", jobs])
+    assert result.exit_code == 0, result.output
+    assert orjson.loads(result.stdout) == [{"ok": {"booked": n}} for n in range(3)]
+
+
+def test_book_appointments_exits_1_on_partial_failure(tmp_path, services):
+    jobs = write_jobs(tmp_path, [{"template": "slot"}, {"template": "slot", "overrides": {"fail": True}}])
+    result = runner.invoke(cli.app, ["book-appointments", jobs])
+    assert result.exit_code == 1
+    results = orjson.loads(result.stdout)
+    assert results[0] == {"ok": {"booked": 0}}
+    assert "error" in results[1]
+
+
+@pytest.mark.parametrize(
+    "jobs",
+    [{"template": "slot"}, [{"overrides": {}}], ["slot"]],
+)
+def test_book_appointments_rejects_bad_jobs_file(tmp_path, services, jobs):
+    result = runner.invoke(cli.app, ["book-appointments", write_jobs(tmp_path, jobs)])
+    assert result.exit_code == 2
+
+
+def test_parse_date():
+    assert cli._parse_date("2024-02-29", "start_date") == date(2024, 2, 29)
+
+
+@pytest.mark.parametrize(
+    ("value", "message"),
+    [("2024-02-30", "not a valid date"), ("2024-1-01", "YYYY-MM-DD"), ("２０２４-01-01", "YYYY-MM-DD")],
+)
+def test_parse_date_rejects_bad_input(value, message):
+    with pytest.raises(typer.BadParameter, match=message):
+        cli._parse_date(value, "start_date")
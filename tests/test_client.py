@@ -0,0 +1,155 @@
+import os
+import stat
+import time
+from pathlib import Path
+
+import orjson
+import pytest
+import requests
+
+from zenoti_tool.client import ZenotiApiClient
+from zenoti_tool.config import ZenotiConfig
+
+
+class FakeResponse:
+    def __init__(self, status_code, data):
+        self.status_code = status_code
+        self.content = orjson.dumps(data)
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} error", response=self)
+
+
+class FakeSession:
+    """Records calls and answers token and API requests without a network."""
+
+    def __init__(self, expires_in=3600, revoked=()):
+        self.expires_in = expires_in
+        self.revoked = {f"Bearer {token}" for token in revoked}
+        self.token_requests = 0
+        self.requests = []
+
+    def mount(self, prefix, adapter):
+        pass
+
+    def post(self, url, **kwargs):
+        self.token_requests += 1
+        return FakeResponse(200, {"access_token": f"token-{self.token_requests}", "expires_in": self.expires_in})
+
+    def request(self, method, url, **kwargs):
+        self.requests.append((method, url, kwargs))
+        if kwargs["headers"]["Authorization"] in self.revoked:
+            return FakeResponse(401, {"error": "revoked"})
+        return FakeResponse(200, {"url": url})
+
+
+def make_config(**overrides):
+    values = {
+        "base_url": "https://api.example.test",
+        "app_id": "app",
+        "app_secret": "secret",
+        "api_key": "key",
+        "token_url": "https://api.example.test/token",
+        "templates_path": Path("templates.jsonl"),
+        "account_name": "account",
+        "user_name": "user",
+        "password": "password",
+    }
+    values.update(overrides)
+    return ZenotiConfig(**values)
+
+
+def test_token_is_fetched_once_and_reused():
+    session = FakeSession()
+    client = ZenotiApiClient(make_config(), session=session)
+
+    client.request("GET", "/v1/a")
+    client.request("GET", "v1/b")
+    assert session.token_requests == 1
+    assert [url for _, url, _ in session.requests] == [
+        "https://api.example.test/v1/a",
+        "https://api.example.test/v1/b",
+    ]
+    assert session.requests[0][2]["headers"]["Authorization"] == "Bearer token-1"
+
+
+def test_short_lived_token_is_fetched_once_per_request():
+    # expires_in below the refresh margin yields a token that is stale on arrival.
+    session = FakeSession(expires_in=30)
+    client = ZenotiApiClient(make_config(), session=session)
+
+    client.request("GET", "/v1/a")
+    assert session.token_requests == 1
+    assert session.requests[0][2]["headers"]["Authorization"] == "Bearer token-1"
+
+
+def write_cache(path, **overrides):
+    data = {
+        "account_name": "account",
+        "user_name": "user",
+        "app_id": "app",
+        "access_token": "cached",
+        "expires_at": time.time() + 600,
+    }
+    data.update(overrides)
+    path.write_bytes(orjson.dumps(data))
+
+
+def test_cached_token_is_reused(tmp_path):
+    cache = tmp_path / "token.json"
+    write_cache(cache)
+    session = FakeSession()
+    client = ZenotiApiClient(make_config(), session=session, token_cache_path=cache)
+
+    assert client.get_access_token() == "cached"
+    assert session.token_requests == 0
+
+
+@pytest.mark.parametrize(
+    "overrides",
+    [{"user_name": "someone-else"}, {"app_id": "other-app"}, {"expires_at": 0}],
+)
+def test_cached_token_is_ignored_for_other_owner_or_when_expired(tmp_path, overrides):
+    cache = tmp_path / "token.json"
+    write_cache(cache, **overrides)
+    session = FakeSession()
+    client = ZenotiApiClient(make_config(), session=session, token_cache_path=cache)
+
+    assert client.get_access_token() == "token-1"
+    assert session.token_requests == 1
+    assert orjson.loads(cache.read_bytes())["access_token"] == "token-1"
+
+
+def test_token_cache_is_private(tmp_path):
+    cache = tmp_path / "token.json"
+    client = ZenotiApiClient(make_config(), session=FakeSession(), token_cache_path=cache)
+
+    client.get_access_token()
+    assert stat.S_IMODE(os.stat(cache).st_mode) == 0o600
+
+
+def test_revoked_token_is_replaced_and_request_retried(tmp_path):
+    cache = tmp_path / "token.json"
+    write_cache(cache)
+    session = FakeSession(revoked=["cached"])
+    client = ZenotiApiClient(make_config(), session=session, token_cache_path=cache)
+
+    response = client.request("GET", "/v1/a")
+    assert response.status_code == 200
+    assert session.token_requests == 1
+    assert [kwargs["headers"]["Authorization"] for _, _, kwargs in session.requests] == [
+        "Bearer cached",
+        "Bearer token-1",
+    ]
+    assert orjson.loads(cache.read_bytes())["access_token"] == "token-1"
+
+
+def test_unauthorized_is_retried_only_once():
+    session = FakeSession(revoked=["token-1", "token-2"])
+    client = ZenotiApiClient(make_config(), session=session)
+
+    with pytest.raises(requests.HTTPError):
+        client.request("GET", "/v1/a")
+    assert session.token_requests == 2
+    assert len(session.requests) == 2
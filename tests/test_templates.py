@@ -0,0 +1,225 @@
+import json
+
+import pytest
+
+from zenoti_tool import templates
+from zenoti_tool.templates import Template, TemplateStore
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    TemplateStore._CACHE.clear()
+    yield
+    TemplateStore._CACHE.clear()
+
+
+def reopen(store):
+    """Drop the shared cache and return a fresh store on the same file."""
+
+    TemplateStore._CACHE.clear()
+    return TemplateStore(store.path)
+
+
+def test_constructor_does_not_touch_disk(tmp_path):
+    path = tmp_path / "nested" / "templates.jsonl"
+    store = TemplateStore(path)
+    assert not path.parent.exists()
+    assert store.names() == []
+    assert path.read_bytes() == b""
+
+
+@pytest.mark.parametrize("remove_dir", [False, True])
+def test_store_recovers_when_file_is_deleted(tmp_path, remove_dir):
+    path = tmp_path / "nested" / "templates.jsonl"
+    store = TemplateStore(path)
+    store.add(Template("a", {}))
+
+    path.unlink()
+    if remove_dir:
+        path.parent.rmdir()
+    assert store.names() == []
+    store.add(Template("b", {}))
+    assert reopen(store).names() == ["b"]
+
+    path.unlink()
+    path.parent.rmdir()
+    store.save([Template("c", {})])
+    assert reopen(store).names() == ["c"]
+
+def test_round_trip(tmp_path):
+    store = TemplateStore(tmp_path / "templates.jsonl")
+    store.save([Template("a", {"x": 1}), Template("b", {"y": [1, 2]})])
+    store.add(Template("c", {}))
+
+    for current in (store, reopen(store)):
+        assert current.names() == ["a", "b", "c"]
+        assert current.list() == [Template("a", {"x": 1}), Template("b", {"y": [1, 2]}), Template("c", {})]
+        assert current.get("b") == Template("b", {"y": [1, 2]})
+        assert current.get("missing") is None
+
+
+def test_records_are_one_line_each_with_name_first(tmp_path):
+    store = TemplateStore(tmp_path / "templates.jsonl")
+    store.save([Template("a", {"x": 1})])
+    assert store.path.read_bytes() == b'{"name":"a","payload":{"x":1}}\n'
+
+
+def test_escaped_names_fall_back_to_full_parse(tmp_path):
+    store = TemplateStore(tmp_path / "templates.jsonl")
+    tricky = 'quote " and \\ backslash'
+    store.save([Template(tricky, {"n": 1}), Template("café", {"n": 2})])
+
+    store = reopen(store)
+    assert store.names() == [tricky, "café"]
+    assert store.get(tricky).payload == {"n": 1}
+    assert store.get("café").payload == {"n": 2}
+
+
+def test_index_follows_external_changes(tmp_path):
+    store = TemplateStore(tmp_path / "templates.jsonl")
+    store.save([Template("a", {})])
+    assert store.names() == ["a"]
+
+    with store.path.open("ab") as fp:
+        fp.write(b'{"name":"external","payload":{"v":2}}\n')
+    assert store.names() == ["a", "external"]
+    assert store.get("external").payload == {"v": 2}
+
+
+def test_legacy_array_is_converted_in_place(tmp_path):
+    path = tmp_path / "templates.json"
+    path.write_text(json.dumps([{"name": "a", "payload": {"x": 1}}], indent=2))
+
+    store = TemplateStore(path)
+    assert store.get("a") == Template("a", {"x": 1})
+    assert path.read_bytes() == b'{"name":"a","payload":{"x":1}}\n'
+
+
+def test_legacy_default_json_seeds_missing_jsonl(tmp_path):
+    legacy = tmp_path / "templates.json"
+    legacy.write_text(json.dumps([{"name": "a", "payload": {}}], indent=2))
+    original = legacy.read_bytes()
+
+    store = TemplateStore(tmp_path / "templates.jsonl")
+    assert store.names() == ["a"]
+    assert legacy.read_bytes() == original
+
+
+def test_remove(tmp_path):
+    store = TemplateStore(tmp_path / "templates.jsonl")
+    store.save([Template("a", {}), Template("b", {}), Template("c", {})])
+
+    store.remove("b")
+    assert store.names() == ["a", "c"]
+    assert reopen(store).names() == ["a", "c"]
+
+    before = store.path.stat().st_mtime_ns
+    store.remove("missing")
+    assert store.path.stat().st_mtime_ns == before
+
+
+def test_remove_leaves_no_temporary_file(tmp_path):
+    store = TemplateStore(tmp_path / "templates.jsonl")
+    store.save([Template("a", {}), Template("b", {})])
+
+    store.remove("a")
+    assert [p.name for p in tmp_path.iterdir()] == ["templates.jsonl"]
+
+def test_add_rejects_existing_name(tmp_path):
+    store = TemplateStore(tmp_path / "templates.jsonl")
+    store.add(Template("a", {}))
+    with pytest.raises(ValueError, match="already exists"):
+        store.add(Template("a", {"other": True}))
+
+
+def test_append_after_unterminated_last_record(tmp_path):
+    path = tmp_path / "templates.jsonl"
+    path.write_bytes(b'{"name":"a","payload":{}}')
+    store = TemplateStore(path)
+
+    store.add(Template("b", {"n": 1}))
+    assert path.read_bytes() == b'{"name":"a","payload":{}}\n{"name":"b","payload":{"n":1}}\n'
+    assert store.get("b").payload == {"n": 1}
+    reloaded = reopen(store)
+    assert reloaded.names() == ["a", "b"]
+    assert reloaded.get("b").payload == {"n": 1}
+
+
+def test_cache_matches_written_data(tmp_path):
+    store = TemplateStore(tmp_path / "templates.jsonl")
+    store.save([Template("a", {2: 3})])
+    store.list()
+    store.add(Template("b", {1: 2}))
+
+    assert store.get("a").payload == {"2": 3}
+    assert store.get("b").payload == {"1": 2}
+    assert store.list() == reopen(store).list()
+
+
+def test_as_json_reuses_stored_records(tmp_path):
+    store = TemplateStore(tmp_path / "templates.jsonl")
+    assert store.as_json() == "[]"
+
+    store.save([Template("a", {"x": 1}), Template("b", {})])
+    assert json.loads(store.as_json()) == [t.to_dict() for t in store.list()]
+    store.add(Template("c", {}))
+    assert [t["name"] for t in json.loads(store.as_json())] == ["a", "b", "c"]
+
+
+def test_save_replaces_file_atomically(tmp_path):
+    store = TemplateStore(tmp_path / "templates.jsonl")
+    store.save([Template("a", {})])
+    store.save([Template("b", {})])
+    assert reopen(store).names() == ["b"]
+    assert [p.name for p in tmp_path.iterdir()] == ["templates.jsonl"]
+
+
+@pytest.mark.parametrize(
+    "batch",
+    [
+        [Template("new", {}), Template("a", {})],
+        [Template("new", {}), Template("new", {})],
+    ],
+)
+def test_add_many_writes_nothing_on_duplicates(tmp_path, batch):
+    store = TemplateStore(tmp_path / "templates.jsonl")
+    store.save([Template("a", {})])
+    before = store.path.read_bytes()
+
+    with pytest.raises(ValueError):
+        store.add_many(batch)
+    assert store.path.read_bytes() == before
+    assert reopen(store).names() == ["a"]
+
+
+def test_add_many_appends_in_one_batch(tmp_path):
+    store = TemplateStore(tmp_path / "templates.jsonl")
+    store.save([Template("a", {})])
+    store.list()
+    store.add_many([Template("b", {"n": 1}), Template("c", {"n": 2})])
+
+    for current in (store, reopen(store)):
+        assert current.names() == ["a", "b", "c"]
+        assert current.get("c").payload == {"n": 2}
+        assert [t.name for t in current.list()] == ["a", "b", "c"]
+
+
+def test_large_store_is_indexed_through_mmap(tmp_path, monkeypatch):
+    monkeypatch.setattr(templates, "_MMAP_THRESHOLD", 0)
+    store = TemplateStore(tmp_path / "templates.jsonl")
+    store.save([Template(f"t{i}", {"i": i}) for i in range(50)] + [Template('a"b', {})])
+
+    store = reopen(store)
+    assert len(store.names()) == 51
+    assert store.get("t49").payload == {"i": 49}
+    assert store.get('a"b') == Template('a"b', {})
+
+
+def test_merged_payload_leaves_template_untouched():
+    template = Template("a", {"x": 1, "y": 2})
+    merged = template.merged_payload({"y": 3})
+    assert merged == {"x": 1, "y": 3}
+    assert template.payload == {"x": 1, "y": 2}
+
+    copy = template.merged_payload()
+    assert copy == template.payload and copy is not template.payload
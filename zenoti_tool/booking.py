@@ -1,28 +1,58 @@
 """Booking helpers built on top of templates."""
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from .client import ZenotiApiClient
+from .config import MAX_CONNECTIONS
 from .templates import Template, TemplateStore
 
 
-@dataclass
+@dataclass(slots=True)
 class BookingManager:
     client: ZenotiApiClient
     templates: TemplateStore
 
-    def book_from_template(
-        self, location_id: str, template_name: str, *, overrides: Optional[Dict[str, Any]] = None
-    ) -> Dict[str, Any]:
+    def _payload(self, template_name: str, overrides: Optional[Dict[str, Any]]) -> Dict[str, Any]:
         template = self.templates.get(template_name)
         if not template:
             raise ValueError(f"Template '{template_name}' not found")
-        payload = template.payload.copy()
-        if overrides:
-            payload.update(overrides)
+        return template.merged_payload(overrides)
+
+    def book_from_template(
+        self, location_id: str, template_name: str, *, overrides: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        payload = self._payload(template_name, overrides)
         return self.client.book_appointment(location_id, payload)
 
+    def book_many(
+        self,
+        location_id: str,
+        jobs: List[Tuple[str, Optional[Dict[str, Any]]]],
+        *,
+        max_workers: int = 10,
+    ) -> List[Dict[str, Any]]:
+        """Book one appointment per ``(template_name, overrides)`` job concurrently.
+
+        Every template is resolved before any request is sent, so an unknown
+        template name books nothing. A failed booking does not stop the others:
+        each job yields ``{"ok": response}`` or ``{"error": message}``, in job order.
+        """
+
+        payloads = [self._payload(template_name, overrides) for template_name, overrides in jobs]
+        if not payloads:
+            return []
+        # Fetch the token up front so workers start with warm headers.
+        self.client.get_access_token()
+        with ThreadPoolExecutor(max_workers=min(len(payloads), max_workers, MAX_CONNECTIONS)) as pool:
+            futures = [pool.submit(self.client.book_appointment, location_id, payload) for payload in payloads]
+        results: List[Dict[str, Any]] = []
+        for future in futures:
+            exc = future.exception()
+            results.append({"error": str(exc)} if exc is not None else {"ok": future.result()})
+        return results
+
     def save_booking_template(self, name: str, payload: Dict[str, Any]) -> None:
         self.templates.add(Template(name=name, payload=payload))
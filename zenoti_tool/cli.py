@@ -1,29 +1,98 @@
 """Command line entrypoints using Typer."""
 from __future__ import annotations
 
-import json
+import dataclasses
+import functools
+import re
+import sys
 from datetime import date, timedelta
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Optional, Tuple
 
+import orjson
 import typer
 
-from .booking import BookingManager
-from .client import ZenotiApiClient
-from .config import ZenotiConfig
-from .invoices import InvoiceManager
+from .config import MAX_CONNECTIONS, ZenotiConfig
 from .templates import Template, TemplateStore
 
+# The API client pulls in requests; commands that need it import it on demand.
+if TYPE_CHECKING:
+    from .client import ZenotiApiClient
+
 app = typer.Typer(help="Utilities for Zenoti invoice and booking workflows.")
 
+_DATE_RE = re.compile(r"[0-9]{4}-[0-9]{2}-[0-9]{2}")
+
+
+@functools.lru_cache(maxsize=1)
+def _load_config() -> ZenotiConfig:
+    return ZenotiConfig.from_env()
 
-def get_services(templates_path: Optional[Path] = None):
-    config = ZenotiConfig.from_env()
+
+def _resolve_config(templates_path: Optional[str]) -> ZenotiConfig:
+    config = _load_config()
     if templates_path:
-        config.templates_path = templates_path
-    template_store = TemplateStore(config.templates_path)
-    client = ZenotiApiClient(config)
-    return template_store, client
+        config = dataclasses.replace(config, templates_path=Path(templates_path))
+    return config
+
+
+@functools.lru_cache(maxsize=4)
+def _store(templates_path: Optional[str]) -> TemplateStore:
+    return TemplateStore(_resolve_config(templates_path).templates_path)
+
+
+@functools.lru_cache(maxsize=4)
+def _client(templates_path: Optional[str]) -> ZenotiApiClient:
+    from .client import TOKEN_CACHE_FILENAME, ZenotiApiClient
+
+    config = _resolve_config(templates_path)
+    return ZenotiApiClient(config, token_cache_path=config.templates_path.parent / TOKEN_CACHE_FILENAME)
+
+
+def get_store(templates_path: Optional[Path] = None) -> TemplateStore:
+    """Return the process-wide template store without creating an API client."""
+
+    return _store(str(templates_path) if templates_path else None)
+
+
+def get_services(templates_path: Optional[Path] = None) -> Tuple[TemplateStore, ZenotiApiClient]:
+    """Return the process-wide template store and API client.
+
+    Services are cached per templates path so the HTTP session and access
+    token are reused by every command run in the same process.
+    """
+
+    key = str(templates_path) if templates_path else None
+    return _store(key), _client(key)
+
+
+@functools.lru_cache(maxsize=32)
+def _load_json_cached(path_str: str, mtime_ns: int):
+    """Parse a JSON file once per modification time; callers must not mutate the result."""
+
+    return orjson.loads(Path(path_str).read_bytes())
+
+
+def _load_json(path: Path):
+    return _load_json_cached(str(path), path.stat().st_mtime_ns)
+
+
+def _emit(obj) -> None:
+    """Write ``obj`` as indented JSON straight to stdout's byte stream."""
+
+    out = sys.stdout.buffer
+    out.write(orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE))
+    out.flush()
+
+
+def _parse_date(value: str, field: str) -> date:
+    if not _DATE_RE.fullmatch(value):
+        raise typer.BadParameter(f"{field} must be in YYYY-MM-DD format")
+    year, month, day = value.split("-")
+    try:
+        return date(int(year), int(month), int(day))
+    except ValueError as exc:
+        raise typer.BadParameter(f"{field} is not a valid date: {exc}")
 
 
 def resolve_location_id(location_id: Optional[str], client: ZenotiApiClient) -> str:
@@ -40,8 +109,8 @@ def auth_token(mask: bool = typer.Option(True, help="Mask the token output for s
     _, client = get_services()
     token = client.get_access_token(force_refresh=True)
     if mask:
-        masked = f"{token[:6]}...{token[-4:]}" if len(token) > 10 else "***"
-        typer.echo(f"Token acquired (masked): {masked}")
+        masked = token[:6] + "..." + token[-4:] if len(token) > 10 else "***"
+        typer.echo("Token acquired (masked): " + masked)
     else:
         typer.echo(token)
 
@@ -49,9 +118,9 @@ def auth_token(mask: bool = typer.Option(True, help="Mask the token output for s
 @app.command()
 def list_templates(templates_path: Optional[Path] = typer.Option(None, help="Path to templates file.")):
     """List available templates."""
-    store, _ = get_services(templates_path)
-    for template in store.list():
-        typer.echo(f"- {template.name}")
+    store = get_store(templates_path)
+    for name in store.names():
+        typer.echo(f"- {name}")
 
 
 @app.command()
@@ -61,8 +130,8 @@ def add_template(
     templates_path: Optional[Path] = typer.Option(None, help="Path to templates file."),
 ):
     """Add a template from a JSON file."""
-    store, _ = get_services(templates_path)
-    payload = json.loads(payload_file.read_text())
+    store = get_store(templates_path)
+    payload = _load_json(payload_file)
     store.add(Template(name=name, payload=payload))
     typer.echo(f"Added template '{name}'.")
 
@@ -70,7 +139,7 @@ def add_template(
 @app.command()
 def remove_template(name: str, templates_path: Optional[Path] = typer.Option(None, help="Path to templates file.")):
     """Remove a template by name."""
-    store, _ = get_services(templates_path)
+    store = get_store(templates_path)
     store.remove(name)
     typer.echo(f"Removed template '{name}'.")
 
@@ -85,17 +154,12 @@ def list_invoices(
     templates_path: Optional[Path] = typer.Option(None),
 ):
     """List appointments for a location (uses appointments endpoint)."""
+    from .invoices import InvoiceManager
+
     store, client = get_services(templates_path)
     resolved_location = resolve_location_id(location_id, client)
-    try:
-        start = date.fromisoformat(start_date) if start_date else date.today()
-    except ValueError:
-        raise typer.BadParameter("start_date must be in YYYY-MM-DD format")
-
-    try:
-        end = date.fromisoformat(end_date) if end_date else (start + timedelta(days=1))
-    except ValueError:
-        raise typer.BadParameter("end_date must be in YYYY-MM-DD format")
+    start = _parse_date(start_date, "start_date") if start_date else date.today()
+    end = _parse_date(end_date, "end_date") if end_date else (start + timedelta(days=1))
 
     if end <= start:
         raise typer.BadParameter("end_date must be after start_date")
@@ -108,7 +172,7 @@ def list_invoices(
         include_no_show_cancel=include_no_show_cancel,
         therapist_id=therapist_id,
     )
-    typer.echo(json.dumps(appointments, indent=2))
+    _emit(appointments)
 
 
 @app.command()
@@ -119,11 +183,13 @@ def create_invoice(
     templates_path: Optional[Path] = typer.Option(None),
 ):
     """Create an invoice from a stored template."""
+    from .invoices import InvoiceManager
+
     store, client = get_services(templates_path)
     resolved_location = resolve_location_id(location_id, client)
-    overrides = json.loads(overrides_file.read_text()) if overrides_file else None
+    overrides = _load_json(overrides_file) if overrides_file else None
     invoice = InvoiceManager(client, store).create_from_template(resolved_location, template_name, overrides=overrides)
-    typer.echo(json.dumps(invoice, indent=2))
+    _emit(invoice)
 
 
 @app.command()
@@ -134,11 +200,42 @@ def book_appointment(
     templates_path: Optional[Path] = typer.Option(None),
 ):
     """Book an appointment from a template."""
+    from .booking import BookingManager
+
     store, client = get_services(templates_path)
     resolved_location = resolve_location_id(location_id, client)
-    overrides = json.loads(overrides_file.read_text()) if overrides_file else None
+    overrides = _load_json(overrides_file) if overrides_file else None
     booking = BookingManager(client, store).book_from_template(resolved_location, template_name, overrides=overrides)
-    typer.echo(json.dumps(booking, indent=2))
+    _emit(booking)
+
+
+@app.command()
+def book_appointments(
+    jobs_file: Path = typer.Argument(
+        ..., exists=True, readable=True, help='JSON array of {"template": ..., "overrides": {...}} jobs.'
+    ),
+    location_id: Optional[str] = typer.Option(None, "--location-id", "-l", help="Location/center identifier."),
+    concurrency: int = typer.Option(
+        10, min=1, max=MAX_CONNECTIONS, help="Maximum number of bookings sent at the same time."
+    ),
+    templates_path: Optional[Path] = typer.Option(None),
+):
+    """Book several appointments from templates concurrently."""
+    from .booking import BookingManager
+
+    store, client = get_services(templates_path)
+    resolved_location = resolve_location_id(location_id, client)
+    jobs = orjson.loads(jobs_file.read_bytes())
+    if not isinstance(jobs, list):
+        raise typer.BadParameter("jobs_file must contain a JSON array")
+    try:
+        pairs = [(job["template"], job.get("overrides")) for job in jobs]
+    except (KeyError, TypeError, AttributeError):
+        raise typer.BadParameter('Each job must be an object with a "template" key')
+    results = BookingManager(client, store).book_many(resolved_location, pairs, max_workers=concurrency)
+    _emit(results)
+    if any("error" in result for result in results):
+        raise typer.Exit(code=1)
 
 
 if __name__ == "__main__":
@@ -1,16 +1,27 @@
 """Zenoti API client with token management."""
 from __future__ import annotations
 
+import logging
+import os
+import threading
 import time
 from dataclasses import dataclass, field
+from pathlib import Path
 from typing import Any, Dict, Optional
 
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
-from .config import ZenotiConfig
+from .config import MAX_CONNECTIONS, ZenotiConfig
 
+TOKEN_CACHE_FILENAME = ".zenoti_token.json"
 
-@dataclass
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
 class TokenInfo:
     access_token: str
     expires_at: float
@@ -31,17 +42,92 @@ class TokenInfo:
         return time.time() < self.expires_at
 
 
-@dataclass
+@dataclass(slots=True)
 class ZenotiApiClient:
     """Simple Zenoti API client with automatic token refresh."""
 
     config: ZenotiConfig
     session: requests.Session = field(default_factory=requests.Session)
     token: Optional[TokenInfo] = None
+    token_cache_path: Optional[Path] = None
+    _base: str = field(default="", init=False, repr=False)
+    _auth_headers: Optional[Dict[str, str]] = field(default=None, init=False, repr=False)
+    _token_lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self._base = self.config.base_url.rstrip("/") + "/"
+        # Keep connections alive between calls and retry transient gateway errors.
+        # Blocking on a full pool reuses connections instead of opening throwaway ones.
+        adapter = HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=MAX_CONNECTIONS,
+            pool_block=True,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.3,
+                status_forcelist=(429, 500, 502, 503, 504),
+                raise_on_status=False,
+            ),
+        )
+        self.session.mount("https://", adapter)
+        if self.token is None and self.token_cache_path:
+            self._set_token(self._read_cached_token())
+        else:
+            self._set_token(self.token)
+
+    def _set_token(self, token: Optional[TokenInfo]) -> None:
+        """Store ``token`` and prebuild the request headers that carry it."""
+
+        self.token = token
+        if token is None:
+            self._auth_headers = None
+            return
+        headers = {
+            **self.config.as_headers(),
+            "Authorization": f"Bearer {token.access_token}",
+            "X-Application-Id": self.config.app_id,
+        }
+        if self.config.center_id:
+            headers["X-Center-Id"] = self.config.center_id
+        self._auth_headers = headers
 
-    def _ensure_token(self) -> str:
-        if self.token and self.token.is_valid():
-            return self.token.access_token
+    def _token_owner(self) -> Dict[str, Optional[str]]:
+        return {
+            "account_name": self.config.account_name,
+            "user_name": self.config.user_name,
+            "app_id": self.config.app_id,
+        }
+
+    def _read_cached_token(self) -> Optional[TokenInfo]:
+        """Return a still-valid token persisted by a previous run, if any."""
+
+        try:
+            data = orjson.loads(self.token_cache_path.read_bytes())
+            if any(data.get(key) != value for key, value in self._token_owner().items()):
+                return None
+            token = TokenInfo(access_token=data["access_token"], expires_at=float(data["expires_at"]))
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            return None
+        return token if token.is_valid() else None
+
+    def _write_cached_token(self) -> None:
+        if not self.token_cache_path or not self.token:
+            return
+        data = {
+            **self._token_owner(),
+            "access_token": self.token.access_token,
+            "expires_at": self.token.expires_at,
+        }
+        try:
+            fd = os.open(self.token_cache_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "wb") as fp:
+                fp.write(orjson.dumps(data))
+        except OSError:
+            # A missing cache only costs a token request on the next run.
+            pass
+
+    def _fetch_token(self) -> None:
+        """Request a new token; the caller must hold ``_token_lock``."""
 
         response = self.session.post(
             self.config.token_url,
@@ -62,45 +148,73 @@ class ZenotiApiClient:
             timeout=30,
         )
 
-        print("Token status:", response.status_code)
-        print("Token body:", response.text)
-
+        logger.debug("Token fetch status=%s", response.status_code)
         response.raise_for_status()
-        self.token = TokenInfo.from_response(response.json())
-        return self.token.access_token
+        self._set_token(TokenInfo.from_response(self.json_bytes(response)))
+        self._write_cached_token()
+
+    def _discard_cached_token(self) -> None:
+        if not self.token_cache_path:
+            return
+        try:
+            self.token_cache_path.unlink(missing_ok=True)
+        except OSError:
+            pass
+
+    def _ensure_token(self) -> str:
+        token = self.token
+        if token and token.is_valid():
+            return token.access_token
+
+        # Concurrent callers wait for a single refresh instead of each fetching a token.
+        with self._token_lock:
+            if not (self.token and self.token.is_valid()):
+                self._fetch_token()
+            return self.token.access_token
 
     def get_access_token(self, *, force_refresh: bool = False) -> str:
         """Return a valid access token, refreshing if needed."""
 
         if force_refresh:
-            self.token = None
+            with self._token_lock:
+                self._set_token(None)
         return self._ensure_token()
 
     def _headers(self) -> Dict[str, str]:
-        token = self._ensure_token()
-        headers = self.config.as_headers()
-        headers.update(
-            {
-                "Authorization": f"Bearer {token}",
-                "X-Application-Id": self.config.app_id,
-            }
-        )
-        if self.config.center_id:
-            headers["X-Center-Id"] = self.config.center_id
-        return headers
+        # Shared across requests; requests merges it into a new dict per call.
+        # Read both once: another thread may reset them during a forced refresh.
+        headers, token = self._auth_headers, self.token
+        if headers is not None and token is not None and token.is_valid():
+            return headers
+        # Use the headers built under the lock even if the new token is already
+        # stale (a very short ``expires_in``); fetching again would never end.
+        with self._token_lock:
+            if self._auth_headers is None or not (self.token and self.token.is_valid()):
+                self._fetch_token()
+            return self._auth_headers
+
+    @staticmethod
+    def json_bytes(response: requests.Response) -> Any:
+        """Decode a response body straight from bytes with orjson."""
+
+        return orjson.loads(response.content)
 
     def request(
         self, method: str, path: str, *, params: Optional[Dict[str, Any]] = None, json: Any = None
     ) -> requests.Response:
-        url = f"{self.config.base_url}/{path.lstrip('/')}"
-        response = self.session.request(
-            method,
-            url,
-            params=params,
-            json=json,
-            headers=self._headers(),
-            timeout=30,
-        )
+        url = self._base + (path[1:] if path.startswith("/") else path)
+        headers = self._headers()
+        response = self.session.request(method, url, params=params, json=json, headers=headers, timeout=30)
+        if response.status_code == 401:
+            # The token was revoked before it expired: forget it, cached copy
+            # included, and retry once with a fresh one.
+            with self._token_lock:
+                if self._auth_headers is headers:
+                    self._set_token(None)
+                    self._discard_cached_token()
+            response = self.session.request(
+                method, url, params=params, json=json, headers=self._headers(), timeout=30
+            )
         response.raise_for_status()
         return response
 
@@ -122,12 +236,12 @@ class ZenotiApiClient:
         if therapist_id:
             params["therapist_id"] = therapist_id
         response = self.request("GET", "v1/appointments", params=params)
-        return response.json()
+        return self.json_bytes(response)
 
     def create_invoice(self, location_id: str, payload: Dict[str, Any]) -> Dict[str, Any]:
         response = self.request("POST", f"v1/locations/{location_id}/invoices", json=payload)
-        return response.json()
+        return self.json_bytes(response)
 
     def book_appointment(self, location_id: str, payload: Dict[str, Any]) -> Dict[str, Any]:
         response = self.request("POST", f"v1/locations/{location_id}/appointments", json=payload)
-        return response.json()
+        return self.json_bytes(response)
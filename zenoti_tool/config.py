@@ -3,14 +3,18 @@ from __future__ import annotations
 
 import os
 import re
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional
 
-from dotenv import load_dotenv
+# Keep-alive connections kept per host; also caps concurrent batch requests.
+MAX_CONNECTIONS = 20
 
+_TRAILING_VERSION = re.compile(r"/v\d+$")
+_DOTENV_LOADED = False
 
-@dataclass
+
+@dataclass(frozen=True)
 class ZenotiConfig:
     """Configuration values derived from environment variables.
 
@@ -20,7 +24,7 @@ class ZenotiConfig:
         app_secret: OAuth client secret / application secret.
         api_key: API key used for Zenoti authentication headers.
         token_url: OAuth token endpoint.
-        templates_path: Path to the JSON file storing appointment templates.
+        templates_path: Path to the NDJSON file storing appointment templates.
         center_id: Optional default location/center identifier.
         account_name: Optional account/tenant identifier for password grant.
         user_name: Optional username for password grant.
@@ -39,6 +43,18 @@ class ZenotiConfig:
     user_name: Optional[str] = None
     password: Optional[str] = None
     device_id: Optional[str] = None
+    _base_headers: Dict[str, str] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(
+            self,
+            "_base_headers",
+            {
+                "Accept": "application/json",
+                "Zenoti-Api-Key": self.api_key,
+                "X-API-Key": self.api_key,
+            },
+        )
 
     @classmethod
     def from_env(
@@ -65,7 +81,12 @@ class ZenotiConfig:
             EnvironmentError: If required environment variables are missing.
         """
 
-        load_dotenv(Path.cwd() / ".env.local", override=False)
+        global _DOTENV_LOADED
+        if not _DOTENV_LOADED:
+            from dotenv import load_dotenv
+
+            load_dotenv(Path.cwd() / ".env.local", override=False)
+            _DOTENV_LOADED = True
 
         base_url = os.environ.get(base_url_var)
         app_id = os.environ.get(app_id_var) or os.environ.get(legacy_client_id_var)
@@ -80,7 +101,7 @@ class ZenotiConfig:
         device_id = os.environ.get(device_id_var)
 
         if not default_templates_path:
-            default_templates_path = Path.cwd() / "data" / "templates.json"
+            default_templates_path = Path.cwd() / "data" / "templates.jsonl"
 
         missing = [
             name
@@ -100,10 +121,11 @@ class ZenotiConfig:
                 f"Missing required environment variables: {', '.join(missing)}"
             )
 
-        base_url = re.sub(r"/v\d+$", "", base_url.rstrip("/"))
+        base_url = _TRAILING_VERSION.sub("", base_url.rstrip("/"))
 
         templates_path = Path(templates_path_str) if templates_path_str else default_templates_path
-        templates_path.parent.mkdir(parents=True, exist_ok=True)
+        if not templates_path.parent.exists():
+            templates_path.parent.mkdir(parents=True, exist_ok=True)
 
         return cls(
             base_url=base_url,
@@ -119,11 +141,10 @@ class ZenotiConfig:
             device_id=device_id,
         )
 
-    def as_headers(self) -> dict:
-        """Return base headers for Zenoti API requests."""
+    def as_headers(self) -> Dict[str, str]:
+        """Return base headers for Zenoti API requests.
+
+        The same dict is returned on every call; copy it before modifying.
+        """
 
-        return {
-            "Accept": "application/json",
-            "Zenoti-Api-Key": self.api_key,
-            "X-API-Key": self.api_key,
-        }
+        return self._base_headers
@@ -8,7 +8,7 @@ from .client import ZenotiApiClient
 from .templates import TemplateStore
 
 
-@dataclass
+@dataclass(slots=True)
 class InvoiceManager:
     client: ZenotiApiClient
     templates: TemplateStore
@@ -37,7 +37,4 @@ class InvoiceManager:
         template = self.templates.get(template_name)
         if not template:
             raise ValueError(f"Template '{template_name}' not found")
-        payload = template.payload.copy()
-        if overrides:
-            payload.update(overrides)
-        return self.client.create_invoice(location_id, payload)
+        return self.client.create_invoice(location_id, template.merged_payload(overrides))
@@ -1,53 +1,279 @@
 """Template persistence for appointment and invoice defaults."""
 from __future__ import annotations
 
-import json
-from dataclasses import dataclass
+import mmap
+import os
+import re
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional
+from typing import ClassVar, Dict, Iterable, List, Optional, Tuple
 
+import orjson
 
-@dataclass
+# Records are written with ``name`` first so it can be read without decoding the payload.
+_NAME_RE = re.compile(rb'^\{"name":[ \t]*"([^"\\]*)"')
+# Stores larger than this are indexed by reading lines from an mmap of the file.
+_MMAP_THRESHOLD = 256 * 1024
+
+
+@dataclass(slots=True)
 class Template:
     name: str
     payload: Dict
 
+    def to_dict(self) -> Dict:
+        return {"name": self.name, "payload": self.payload}
+
+    def merged_payload(self, overrides: Optional[Dict] = None) -> Dict:
+        """Return a copy of the payload with ``overrides`` applied.
+
+        Always a fresh dict: the payload itself is shared with the store cache.
+        """
+
+        return {**self.payload, **overrides} if overrides else dict(self.payload)
+
+
+@dataclass
+class _Snapshot:
+    """Index and parsed records for one version of a store file."""
+
+    stamp: Tuple[int, int]
+    offsets: Dict[str, int]
+    parsed: Dict[str, Template] = field(default_factory=dict)
+    templates: Optional[List[Template]] = None
+    encoded: Optional[str] = None
+
+
+def _encode(template: Template) -> bytes:
+    return orjson.dumps(template.to_dict(), option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS)
+
+
+def _from_record(record: Dict) -> Template:
+    return Template(record["name"], record["payload"])
+
+
+def _line_name(line: bytes) -> Optional[str]:
+    match = _NAME_RE.match(line)
+    if match:
+        return match.group(1).decode()
+    if not line.strip():
+        return None
+    # Escaped names fall back to a full parse of the record.
+    return orjson.loads(line)["name"]
+
+
+def _scan(lines: Iterable[bytes]) -> Dict[str, int]:
+    """Map each template name to the byte offset of its record."""
+
+    offsets: Dict[str, int] = {}
+    offset = 0
+    for line in lines:
+        name = _line_name(line)
+        if name is not None and name not in offsets:
+            offsets[name] = offset
+        offset += len(line)
+    return offsets
+
 
 class TemplateStore:
-    """JSON-backed template storage."""
+    """Template storage backed by newline-delimited JSON, one template per line.
+
+    Parsed records are cached per file and shared by every store pointing at
+    it, so templates returned by :meth:`get` and :meth:`list` must not be
+    mutated.
+    """
+
+    _CACHE: ClassVar[Dict[Path, _Snapshot]] = {}
 
     def __init__(self, path: Path):
         self.path = path
+        self._prepared = False
+
+    def _prepare(self) -> None:
+        """Create the store file on first use, converting a legacy JSON array if found.
+
+        A missing ``.jsonl`` store is seeded from a ``.json`` file of the same
+        name, which is where older versions kept templates by default. The old
+        file is left in place.
+        """
+
+        if self._prepared:
+            return
+        self._prepared = True
         self.path.parent.mkdir(parents=True, exist_ok=True)
+        legacy = self.path.with_suffix(".json")
+        if not self.path.exists() and self.path.suffix == ".jsonl" and legacy.is_file():
+            self.path.write_bytes(legacy.read_bytes())
         if not self.path.exists():
-            self.save([])
+            self.path.touch()
+        else:
+            self._migrate_legacy()
+
+    def _migrate_legacy(self) -> None:
+        """Rewrite a store saved as a single JSON array into one record per line."""
+
+        with self.path.open("rb") as fp:
+            head = fp.read(64).lstrip()
+        if head[:1] != b"[":
+            return
+        data = orjson.loads(self.path.read_bytes())
+        self.save(map(_from_record, data))
+
+    def _tmp_path(self) -> Path:
+        return self.path.with_name(self.path.name + ".tmp")
+
+    def _stamp(self) -> Tuple[int, int]:
+        self._prepare()
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            # Deleted since it was prepared (long-lived cached stores); start over empty.
+            self._prepared = False
+            self._prepare()
+            stat = os.stat(self.path)
+        return stat.st_mtime_ns, stat.st_size
+
+    def _snapshot(self) -> _Snapshot:
+        """Return the cached index for the file, rebuilt when the file changes."""
+
+        stamp = self._stamp()
+        snapshot = self._CACHE.get(self.path)
+        if snapshot is None or snapshot.stamp != stamp:
+            with self.path.open("rb") as fp:
+                if stamp[1] > _MMAP_THRESHOLD:
+                    with mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        offsets = _scan(iter(mm.readline, b""))
+                else:
+                    offsets = _scan(fp)
+            snapshot = self._CACHE[self.path] = _Snapshot(stamp, offsets)
+        return snapshot
+
+    def _invalidate(self) -> None:
+        self._CACHE.pop(self.path, None)
 
     def load(self) -> List[Template]:
-        with self.path.open() as fp:
-            data = json.load(fp)
-        return [Template(**item) for item in data]
+        stamp = self._stamp()
+        snapshot = self._CACHE.get(self.path)
+        if snapshot is None or snapshot.stamp != stamp or snapshot.templates is None:
+            offsets: Dict[str, int] = {}
+            parsed: Dict[str, Template] = {}
+            templates = []
+            offset = 0
+            with self.path.open("rb") as fp:
+                for line in fp:
+                    if line.strip():
+                        template = _from_record(orjson.loads(line))
+                        templates.append(template)
+                        if template.name not in offsets:
+                            offsets[template.name] = offset
+                            parsed[template.name] = template
+                    offset += len(line)
+            snapshot = self._CACHE[self.path] = _Snapshot(stamp, offsets, parsed, templates)
+        return list(snapshot.templates)
 
     def save(self, templates: Iterable[Template]) -> None:
-        serializable = [template.__dict__ for template in templates]
-        with self.path.open("w") as fp:
-            json.dump(serializable, fp, indent=2)
+        self._stamp()
+        templates = list(templates)
+        records = [_encode(template) for template in templates]
+        # Write a sibling file and swap it in so readers never see a partial store.
+        tmp = self._tmp_path()
+        tmp.write_bytes(b"".join(records))
+        os.replace(tmp, self.path)
+        # Seed the cache from the written records, not the caller's objects, so
+        # cached templates match what a reload returns (e.g. non-str keys).
+        templates = [_from_record(orjson.loads(record)) for record in records]
+        offsets: Dict[str, int] = {}
+        parsed: Dict[str, Template] = {}
+        offset = 0
+        for template, record in zip(templates, records):
+            if template.name not in offsets:
+                offsets[template.name] = offset
+                parsed[template.name] = template
+            offset += len(record)
+        self._CACHE[self.path] = _Snapshot(self._stamp(), offsets, parsed, templates)
 
     def list(self) -> List[Template]:
         return self.load()
 
+    def as_json(self) -> str:
+        """Return all templates as a JSON array, reusing the stored records as-is."""
+
+        snapshot = self._snapshot()
+        if snapshot.encoded is None:
+            records = [line for line in self.path.read_bytes().splitlines() if line.strip()]
+            snapshot.encoded = (b"[" + b",".join(records) + b"]").decode()
+        return snapshot.encoded
+
+    def names(self) -> List[str]:
+        """Return template names without decoding their payloads."""
+
+        return list(self._snapshot().offsets)
+
     def add(self, template: Template) -> None:
-        templates = self.load()
-        if any(t.name == template.name for t in templates):
-            raise ValueError(f"Template '{template.name}' already exists")
-        templates.append(template)
-        self.save(templates)
+        self.add_many([template])
+
+    def add_many(self, templates: Iterable[Template]) -> None:
+        """Append several templates in one write.
+
+        Raises:
+            ValueError: If a name already exists or repeats; nothing is written then.
+        """
+
+        snapshot = self._snapshot()
+        new: Dict[str, Template] = {}
+        for template in templates:
+            if template.name in snapshot.offsets:
+                raise ValueError(f"Template '{template.name}' already exists")
+            if template.name in new:
+                raise ValueError(f"Template '{template.name}' is given more than once")
+            new[template.name] = template
+        if not new:
+            return
+        records = [_encode(template) for template in new.values()]
+        with self.path.open("a+b") as fp:
+            end = fp.seek(0, os.SEEK_END)
+            # A hand-edited file may lack the final newline; terminate its last record first.
+            separator = b""
+            if end:
+                fp.seek(end - 1)
+                if fp.read(1) != b"\n":
+                    separator = b"\n"
+            fp.write(separator + b"".join(records))
+        if end != snapshot.stamp[1]:
+            # Someone else wrote to the file since it was indexed.
+            self._invalidate()
+            return
+        snapshot.stamp = self._stamp()
+        written = [_from_record(orjson.loads(record)) for record in records]
+        offset = end + len(separator)
+        for template, record in zip(written, records):
+            snapshot.offsets[template.name] = offset
+            snapshot.parsed[template.name] = template
+            offset += len(record)
+        if snapshot.templates is not None:
+            snapshot.templates.extend(written)
+        snapshot.encoded = None
 
     def remove(self, name: str) -> None:
-        templates = [t for t in self.load() if t.name != name]
-        self.save(templates)
+        if name not in self._snapshot().offsets:
+            return
+        # Stream the surviving records into a sibling file instead of buffering the store.
+        tmp = self._tmp_path()
+        with self.path.open("rb") as src, tmp.open("wb") as dst:
+            for line in src:
+                if _line_name(line) not in (None, name):
+                    dst.write(line)
+        os.replace(tmp, self.path)
+        self._invalidate()
 
     def get(self, name: str) -> Optional[Template]:
-        for template in self.load():
-            if template.name == name:
-                return template
-        return None
+        snapshot = self._snapshot()
+        template = snapshot.parsed.get(name)
+        if template is None:
+            offset = snapshot.offsets.get(name)
+            if offset is None:
+                return None
+            with self.path.open("rb") as fp:
+                fp.seek(offset)
+                template = snapshot.parsed[name] = _from_record(orjson.loads(fp.readline()))
+        return template
@@ -1,10 +1,11 @@
 """Optional Streamlit UI for managing invoices and templates."""
 from __future__ import annotations
 
-import json
+import dataclasses
 from pathlib import Path
 from typing import Optional
 
+import orjson
 import streamlit as st
 
 from .booking import BookingManager
@@ -13,30 +14,35 @@ from .config import ZenotiConfig
 from .invoices import InvoiceManager
 from .templates import Template, TemplateStore
 
+# Text-area contents that mean "no JSON given"; these skip parsing entirely.
+_EMPTY_JSON = ("", "{}")
 
-def load_services(templates_path: Optional[Path] = None):
+
+@st.cache_resource
+def load_services(templates_path: Optional[str] = None):
     config = ZenotiConfig.from_env()
     if templates_path:
-        config.templates_path = templates_path
+        config = dataclasses.replace(config, templates_path=Path(templates_path))
     store = TemplateStore(config.templates_path)
     client = ZenotiApiClient(config)
     return store, client
 
 
 def main():
+    _loads = orjson.loads
     st.title("Zenoti Booking & Invoice Helper")
 
-    templates_path = st.text_input("Templates file", value=str(Path.cwd() / "data" / "templates.json"))
-    store, client = load_services(Path(templates_path))
+    templates_path = st.text_input("Templates file", value=str(Path.cwd() / "data" / "templates.jsonl"))
+    store, client = load_services(templates_path)
     invoice_manager = InvoiceManager(client, store)
     booking_manager = BookingManager(client, store)
+    template_names = store.names()
 
     tab_templates, tab_invoices, tab_booking = st.tabs(["Templates", "Invoices", "Bookings"])
 
     with tab_templates:
         st.subheader("Stored templates")
-        templates = store.list()
-        st.json([template.__dict__ for template in templates])
+        st.json(store.as_json())
 
         with st.form("add_template"):
             st.write("Add a new template")
@@ -45,8 +51,9 @@ def main():
             submitted = st.form_submit_button("Save")
             if submitted:
                 try:
-                    payload = json.loads(payload_text)
+                    payload = {} if payload_text.strip() in _EMPTY_JSON else _loads(payload_text)
                     store.add(Template(name=name, payload=payload))
+                    template_names = store.names()
                     st.success(f"Added template '{name}'.")
                 except Exception as exc:  # noqa: BLE001
                     st.error(str(exc))
@@ -54,11 +61,11 @@ def main():
     with tab_invoices:
         st.subheader("Create invoice from template")
         location_id = st.text_input("Location ID", key="invoice_location")
-        template_name = st.selectbox("Template", [t.name for t in store.list()]) if store.list() else None
+        template_name = st.selectbox("Template", template_names) if template_names else None
         overrides_text = st.text_area("Overrides (JSON)", value="{}", key="invoice_overrides")
         if st.button("Create invoice"):
             try:
-                overrides = json.loads(overrides_text) if overrides_text.strip() else None
+                overrides = None if overrides_text.strip() in _EMPTY_JSON else _loads(overrides_text)
                 response = invoice_manager.create_from_template(location_id, template_name, overrides=overrides)
                 st.json(response)
             except Exception as exc:  # noqa: BLE001
@@ -68,12 +75,12 @@ def main():
         st.subheader("Book appointment from template")
         location_id = st.text_input("Location ID", key="booking_location")
         template_name = (
-            st.selectbox("Template", [t.name for t in store.list()], key="booking_template") if store.list() else None
+            st.selectbox("Template", template_names, key="booking_template") if template_names else None
         )
         overrides_text = st.text_area("Overrides (JSON)", value="{}", key="booking_overrides")
         if st.button("Book appointment"):
             try:
-                overrides = json.loads(overrides_text) if overrides_text.strip() else None
+                overrides = None if overrides_text.strip() in _EMPTY_JSON else _loads(overrides_text)
                 response = booking_manager.book_from_template(location_id, template_name, overrides=overrides)
                 st.json(response)
             except Exception as exc:  # noqa: BLE001